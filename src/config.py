@@ -5,6 +5,8 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     TITLE: str = "PDF to DOCX Converter"
     PORT: int = 8000
+    # processos do pool de conversão (None = CPUs disponíveis ao processo, até 4)
+    CONVERSION_WORKERS: int | None = None
 
     class Config:
         env_file = ".env"
@@ -22,3 +22,6 @@ class BadRequest(MyHttpException):
     def __init__(self, detail: Any):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
+class ServiceUnavailable(MyHttpException):
+    def __init__(self, detail: Any):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import StreamingResponse
 from src.html_to_docx.service import convert_html_to_docx
 from src.constants import DOCX_MIME_TYPE
+from src.responses import TempFileResponse
 from src.html_to_docx.dependencies import html_dependency
 
 router = APIRouter()
@@ -14,11 +14,11 @@ router = APIRouter()
     description="Recebe um arquivo HTML e converte para DOCX. "
                 "Distingue tabelas de dados de tabelas de layout automaticamente.",
     summary="Converter HTML em DOCX",
-    response_class=StreamingResponse,
+    response_class=TempFileResponse,
 )
 async def convert_html_file(
     html: dict = Depends(html_dependency),
-) -> StreamingResponse:
+) -> TempFileResponse:
     """
     Converte HTML diretamente para DOCX.
     
@@ -31,15 +31,16 @@ async def convert_html_file(
     - Hyperlinks
     - Estilos CSS de classes e inline
     """
-    docx_buffer = await convert_html_to_docx(html.get("content"))
+    docx_path = await convert_html_to_docx(html.get("content"))
 
     filename = html.get("filename", "document")
     if filename.endswith(".html"):
         filename = filename[:-5]
     filename = f"{filename}.docx"
 
-    return StreamingResponse(
-        docx_buffer,
+    # servido direto do arquivo temporário, removido depois do envio
+    return TempFileResponse(
+        docx_path,
         media_type=DOCX_MIME_TYPE,
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"; charset=utf-8'
@@ -1,29 +1,66 @@
 import re
-from dataclasses import dataclass
+from copy import deepcopy
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from io import BytesIO
-from typing import Iterable
+from types import MappingProxyType
+from typing import Iterable, Mapping
 import base64
+import os
+import tempfile
 
-from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4 import BeautifulSoup, FeatureNotFound, NavigableString, SoupStrainer, Tag
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.opc.constants import RELATIONSHIP_TYPE
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 from docx.shared import Cm, Inches, Pt, RGBColor
-from fastapi.concurrency import run_in_threadpool
+from docx.table import _Cell
 
 from src.html_to_docx.exceptions import HTMLConversionError
+from src.process_pool import run_in_process_pool
+
+
+# Estilo inline como bitfield (empilhar/restaurar um int é bem mais barato
+# que instanciar um dataclass por nível de formatação).
+_BOLD = 1
+_ITALIC = 2
+_UNDERLINE = 4
+
+_INLINE_STYLE_BITS = {
+    "strong": _BOLD,
+    "b": _BOLD,
+    "em": _ITALIC,
+    "i": _ITALIC,
+    "u": _UNDERLINE,
+}
 
 
 @dataclass(frozen=True)
-class InlineStyle:
-    bold: bool = False
-    italic: bool = False
-    underline: bool = False
+class RenderContext:
+    """
+    Estado de uma conversão, passado adiante na travessia (nada de globais:
+    conversões concorrentes não se enxergam).
 
+    `css_classes` e `style_cache` valem pro documento inteiro; `text_align` é
+    herdado de cima pra baixo (evita subir a árvore a cada nó pra descobrir o
+    text-align efetivo).
+    """
+    css_classes: Mapping[str, Mapping[str, str]]
+    # memo de _style_map_for (chave: id(tag)); vive só enquanto a soup existe
+    style_cache: dict[int, dict[str, str]]
+    text_align: str | None = None
+
+    def enter(self, tag: Tag) -> "RenderContext":
+        align = (_style_map_for(self, tag).get("text-align") or "").lower()
+        if not align or align == self.text_align:
+            return self
+        return replace(self, text_align=align)
 
-BLOCK_TAGS = {
+
+# Nomes de tag já chegam em minúsculas (lxml e html.parser normalizam).
+BLOCK_TAGS = frozenset({
     "h1",
     "h2",
     "h3",
@@ -42,11 +79,41 @@ BLOCK_TAGS = {
     "li",
     "img",
     "hr",
-}
-
-
-# Regras CSS por classe (parse simplificado de <style>).
-_CSS_CLASS_STYLES: dict[str, dict[str, str]] = {}
+})
+
+_HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+
+
+_NO_CSS_CLASSES: Mapping[str, Mapping[str, str]] = MappingProxyType({})
+
+# Regexes pré-compiladas (chamadas por nó de texto / por tag).
+# Aberturas de comentário/<style> e fechamento de </style>, varridos direto do
+# HTML bruto (sem montar a árvore do <head>); ver _extract_css_text.
+_STYLE_OPEN_RE = re.compile(r"<!--|<style\b", re.IGNORECASE)
+_STYLE_CLOSE_RE = re.compile(r"</style\s*>", re.IGNORECASE)
+_HTML_OPEN_RE = re.compile(r"<html\b", re.IGNORECASE)
+_CSS_COMMENT_RE = re.compile(r"/\*[\s\S]*?\*/")
+_CSS_RULE_RE = re.compile(r"\.(?P<cls>[A-Za-z0-9_-]+)\s*\{(?P<body>[^}]+)\}")
+_PX_RE = re.compile(r"(\d+(?:\.\d+)?)\s*px", re.IGNORECASE)
+
+# Nomes qualificados (Clark notation) resolvidos uma vez, fora dos loops.
+_QN_TBL_BORDERS = qn("w:tblBorders")
+_QN_VAL = qn("w:val")
+_QN_R_ID = qn("r:id")
+_QN_P = qn("w:p")
+_QN_XML_SPACE = qn("xml:space")
+_TBL_BORDER_EDGES = tuple(
+    (f"w:{edge}", qn(f"w:{edge}")) for edge in ("top", "left", "bottom", "right", "insideH", "insideV")
+)
+
+# Ações da pilha de _walk.
+_WALK_CONTAINER = 0  # filhos de uma tag container -> destino
+_WALK_BLOCK = 1  # tag de bloco -> destino
+_WALK_LIST_ITEM = 2  # <li> de ul/ol -> destino
+_WALK_TEXT = 3  # texto solto em container -> parágrafo próprio
+_WALK_INLINE_ROOT = 4  # tag inline solta em container -> parágrafo próprio
+_WALK_INLINE = 5  # nó inline -> parágrafo (destino)
+_WALK_RESTORE_STYLE = 6  # fim de uma tag de formatação: nó = estilo anterior
 
 
 def _set_default_document_style(doc: Document, font_name: str = "Calibri", font_size_pt: int = 11) -> None:
@@ -57,43 +124,103 @@ def _set_default_document_style(doc: Document, font_name: str = "Calibri", font_
     style.paragraph_format.line_spacing = 1.5
 
 
+def _make_soup(html_content: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+    """
+    Usa o parser lxml (C, bem mais rápido em e-mails grandes); cai pro
+    html.parser da stdlib quando o lxml não está instalado.
+
+    huge_tree: sem ele a libxml2 corta atributos acima de ~10 MB e um
+    src="data:image/...;base64,..." grande chega vazio (imagem some sem erro).
+    """
+    try:
+        return BeautifulSoup(html_content, "lxml", parse_only=parse_only, huge_tree=True)
+    except FeatureNotFound:
+        return BeautifulSoup(html_content, "html.parser", parse_only=parse_only)
+
+
+def _extract_css_text(html_content: str) -> str:
+    """
+    Conteúdo dos blocos <style>, numa única passada pelo texto.
+
+    Comentários são pulados inteiros: um <style> dentro de
+    <!--[if mso]>...<![endif]--> não vale (o parser também o ignora), mas um
+    <!-- ... --> dentro do <style> continua sendo CSS. Abertura sem
+    terminador encerra a varredura (nada depois fecharia); regex com corpo
+    lazy aqui seria quadrática em HTML com aberturas soltas.
+    """
+    html_content = html_content or ""
+    blocks: list[str] = []
+    pos = 0
+    while (m := _STYLE_OPEN_RE.search(html_content, pos)) is not None:
+        if m.group() == "<!--":
+            end = html_content.find("-->", m.end())
+            if end < 0:
+                break
+            pos = end + 3
+            continue
+        start = html_content.find(">", m.end())
+        if start < 0:
+            break
+        close = _STYLE_CLOSE_RE.search(html_content, start + 1)
+        if close is None:
+            break
+        blocks.append(html_content[start + 1 : close.start()])
+        pos = close.end()
+    return "\n".join(blocks)
+
+
 def _normalize_ws(text: str) -> str:
-    return re.sub(r"\s+", " ", text or "").strip()
+    # str.split() sem argumento já colapsa/remove whitespace em C (mais rápido que regex)
+    return " ".join((text or "").split())
 
 
-def _parse_css_class_rules(css_text: str) -> dict[str, dict[str, str]]:
+@lru_cache(maxsize=64)
+def _parse_css_class_rules(css_text: str) -> Mapping[str, Mapping[str, str]]:
     """
     Parser simples de CSS: captura regras do tipo `.classe { a:b; c:d }`.
     Suficiente pra HTML de e-mail (logo-img, header-title, etc.).
+    Cacheado pelo texto do CSS: e-mails do mesmo template não re-parseiam o
+    <style>. Por isso o retorno é somente-leitura em todos os níveis.
     """
-    out: dict[str, dict[str, str]] = {}
+    out: dict[str, Mapping[str, str]] = {}
     if not css_text:
-        return out
+        return MappingProxyType(out)
 
     # remove comentários
-    css_text = re.sub(r"/\*[\s\S]*?\*/", "", css_text)
+    css_text = _CSS_COMMENT_RE.sub("", css_text)
     # captura blocos `.foo { ... }` (sem suportar seletores complexos)
-    for m in re.finditer(r"\.(?P<cls>[A-Za-z0-9_-]+)\s*\{(?P<body>[^}]+)\}", css_text):
+    for m in _CSS_RULE_RE.finditer(css_text):
         cls = m.group("cls")
         body = m.group("body")
-        out[cls] = _parse_style_attr(body)
-    return out
+        out[cls] = MappingProxyType(_parse_style_attr(body))
+    return MappingProxyType(out)
 
 
-def _style_map_for(tag: Tag) -> dict[str, str]:
+def _style_map_for(ctx: RenderContext, tag: Tag) -> dict[str, str]:
     """
     Merge de estilos: primeiro CSS por class, depois style inline (inline ganha).
+    O resultado fica memoizado por tag durante a conversão (não mutar).
     """
+    key = id(tag)
+    cached = ctx.style_cache.get(key)
+    if cached is not None:
+        return cached
+
     merged: dict[str, str] = {}
+    css_classes = ctx.css_classes
     for cls in (tag.get("class") or []):
-        merged.update(_CSS_CLASS_STYLES.get(str(cls), {}))
+        merged.update(css_classes.get(str(cls), {}))
     merged.update(_parse_style_attr(tag.get("style") or ""))
+    ctx.style_cache[key] = merged
     return merged
 
 
+@lru_cache(maxsize=2048)
 def _parse_style_attr(style: str) -> dict[str, str]:
     """
     Converte "a:b; c:d" em {"a": "b", "c": "d"} (lowercase).
+    Cacheado por string: templates de e-mail repetem o mesmo style="..." em
+    centenas de células. O dict retornado é compartilhado (não mutar).
     """
     out: dict[str, str] = {}
     for part in (style or "").split(";"):
@@ -111,7 +238,7 @@ def _extract_px(style_map: dict[str, str], prop: str) -> int | None:
     val = style_map.get(prop.lower())
     if not val:
         return None
-    m = re.search(r"(\d+(?:\.\d+)?)\s*px", val, flags=re.IGNORECASE)
+    m = _PX_RE.search(val)
     if not m:
         return None
     try:
@@ -120,33 +247,80 @@ def _extract_px(style_map: dict[str, str], prop: str) -> int | None:
         return None
 
 
-def _closest_text_align_right(tag: Tag) -> bool:
+def _root_context(ctx: RenderContext, root: Tag) -> RenderContext:
     """
-    Sobe a árvore procurando style="text-align: right" (comum em HTML de e-mail).
+    Contexto inicial: aplica o text-align dos ancestrais do nó raiz (de cima
+    pra baixo). Daqui em diante o estado desce nos itens da pilha de _walk.
     """
-    cur: Tag | None = tag
+    ancestors: list[Tag] = []
+    cur = root.parent
     while isinstance(cur, Tag):
-        style_map = _style_map_for(cur)
-        align = (style_map.get("text-align") or "").lower()
-        if align == "right":
-            return True
-        cur = cur.parent if isinstance(cur.parent, Tag) else None
-    return False
+        ancestors.append(cur)
+        cur = cur.parent
+    for tag in reversed(ancestors):
+        ctx = ctx.enter(tag)
+    return ctx
+
+
+def _html_tag_context(ctx: RenderContext, html_content: str) -> RenderContext:
+    """
+    O SoupStrainer("body") descarta o <html>: o text-align que ele passaria
+    adiante (style/class) vem da tag de abertura, parseada sozinha.
+    """
+    m = _HTML_OPEN_RE.search(html_content)
+    if m is None:
+        return ctx
+    end = html_content.find(">", m.end())
+    if end < 0:
+        return ctx
+    html_tag = _make_soup(html_content[m.start() : end + 1]).html
+    if html_tag is None:
+        return ctx
+    # memo à parte: o id() da tag avulsa pode ser reusado por tags do <body>
+    entered = replace(ctx, style_cache={}).enter(html_tag)
+    return replace(entered, style_cache=ctx.style_cache)
 
 
 def _remove_table_borders(table) -> None:
     tbl = table._tbl  # noqa: SLF001
     tbl_pr = tbl.tblPr
-    borders = tbl_pr.find(qn("w:tblBorders"))
+    borders = tbl_pr.find(_QN_TBL_BORDERS)
     if borders is None:
         borders = OxmlElement("w:tblBorders")
         tbl_pr.append(borders)
-    for edge in ("top", "left", "bottom", "right", "insideH", "insideV"):
-        element = borders.find(qn(f"w:{edge}"))
+    for edge_tag, edge_qn in _TBL_BORDER_EDGES:
+        element = borders.find(edge_qn)
         if element is None:
-            element = OxmlElement(f"w:{edge}")
+            element = OxmlElement(edge_tag)
             borders.append(element)
-        element.set(qn("w:val"), "nil")
+        element.set(_QN_VAL, "nil")
+
+
+def _fast_cell_text(tc, text: str) -> None:
+    """
+    Equivalente a `cell.text = text` sobre o <w:tc>, mas monta o <w:p><w:r><w:t>
+    direto (o setter do python-docx reconstrói o conteúdo da célula a cada atribuição).
+    """
+    for p in tc.findall(_QN_P):
+        tc.remove(p)
+    p = OxmlElement("w:p")
+    if text:
+        r = OxmlElement("w:r")
+        t = OxmlElement("w:t")
+        t.text = text
+        t.set(_QN_XML_SPACE, "preserve")
+        r.append(t)
+        p.append(r)
+    tc.append(p)
+
+
+def _iter_table_tc_rows(tbl) -> Iterable[list]:
+    """
+    <w:tc> de cada linha de uma tabela recém-criada (sem mesclagens), direto do
+    XML: `tbl.cell(i, j)` recalcula a grade inteira a cada chamada.
+    """
+    for tr in tbl._tbl.tr_lst:  # noqa: SLF001
+        yield tr.tc_lst
 
 
 def _is_real_table(table: Tag) -> bool:
@@ -171,50 +345,79 @@ def _is_real_table(table: Tag) -> bool:
     return False
 
 
-def _iter_child_nodes(tag: Tag) -> Iterable[object]:
+def _direct_rows(table_tag: Tag) -> Iterable[Tag]:
+    """
+    <tr> que pertencem à própria tabela (filhos diretos ou via thead/tbody/tfoot),
+    sem descer em tabelas aninhadas.
+    """
+    for child in table_tag.children:
+        if not isinstance(child, Tag):
+            continue
+        if child.name == "tr":
+            yield child
+        elif child.name in ("thead", "tbody", "tfoot"):
+            for grandchild in child.children:
+                if isinstance(grandchild, Tag) and grandchild.name == "tr":
+                    yield grandchild
+
+
+def _iter_child_nodes(tag: Tag) -> Iterable[str | Tag]:
+    """
+    Filhos relevantes: Tags e textos não vazios. Textos já saem como `str`
+    (convertidos uma única vez), com o whitespace original preservado.
+    """
     for child in tag.children:
         if isinstance(child, NavigableString):
-            if str(child).strip():
-                yield child
+            text = str(child)
+            if text and not text.isspace():
+                yield text
         elif isinstance(child, Tag):
             yield child
 
 
-def _add_hyperlink(paragraph, url: str, text: str, style: InlineStyle) -> None:
+def _build_hyperlink_run_props(style: int):
+    r_pr = OxmlElement("w:rPr")
+    if style & _BOLD:
+        r_pr.append(OxmlElement("w:b"))
+    if style & _ITALIC:
+        r_pr.append(OxmlElement("w:i"))
+    u = OxmlElement("w:u")
+    u.set(_QN_VAL, "single")
+    r_pr.append(u)
+    color = OxmlElement("w:color")
+    color.set(_QN_VAL, "0000FF")
+    r_pr.append(color)
+    return r_pr
+
+
+# <w:rPr> de hyperlink (sublinhado azul) pré-montado por combinação bold/italic;
+# cada link recebe uma cópia.
+_HYPERLINK_RUN_PROPS = {style: _build_hyperlink_run_props(style) for style in (0, _BOLD, _ITALIC, _BOLD | _ITALIC)}
+
+
+def _add_styled_run(paragraph, text: str, style: int) -> None:
+    run = paragraph.add_run(text)
+    run.bold = bool(style & _BOLD)
+    run.italic = bool(style & _ITALIC)
+    run.underline = bool(style & _UNDERLINE)
+
+
+def _add_hyperlink(paragraph, url: str, text: str, style: int) -> None:
     """
     python-docx não tem API de hyperlink de alto nível; precisamos inserir XML.
     """
     if not url:
-        run = paragraph.add_run(text)
-        run.bold = style.bold
-        run.italic = style.italic
-        run.underline = style.underline
+        _add_styled_run(paragraph, text, style)
         return
 
     part = paragraph.part
     r_id = part.relate_to(url, RELATIONSHIP_TYPE.HYPERLINK, is_external=True)
 
     hyperlink = OxmlElement("w:hyperlink")
-    hyperlink.set(qn("r:id"), r_id)
+    hyperlink.set(_QN_R_ID, r_id)
 
     new_run = OxmlElement("w:r")
-    r_pr = OxmlElement("w:rPr")
-
-    if style.bold:
-        b = OxmlElement("w:b")
-        r_pr.append(b)
-    if style.italic:
-        i = OxmlElement("w:i")
-        r_pr.append(i)
-    u = OxmlElement("w:u")
-    u.set(qn("w:val"), "single")
-    r_pr.append(u)
-
-    color = OxmlElement("w:color")
-    color.set(qn("w:val"), "0000FF")
-    r_pr.append(color)
-
-    new_run.append(r_pr)
+    new_run.append(deepcopy(_HYPERLINK_RUN_PROPS[style & (_BOLD | _ITALIC)]))
     t = OxmlElement("w:t")
     t.text = text
     new_run.append(t)
@@ -222,15 +425,15 @@ def _add_hyperlink(paragraph, url: str, text: str, style: InlineStyle) -> None:
     paragraph._p.append(hyperlink)  # noqa: SLF001 (python-docx API interna)
 
 
-def _add_image(container, img: Tag) -> None:
+def _add_image(ctx: RenderContext, container, img: Tag) -> None:
     src = (img.get("src") or "").strip()
     if not src:
         return
 
     # Caso comum em emails: data:image/png;base64,...
-    m = re.match(r"^data:image/(?P<fmt>[^;]+);base64,(?P<b64>.+)$", src, flags=re.IGNORECASE | re.DOTALL)
-    if m:
-        b64 = m.group("b64")
+    # Só o cabeçalho (antes da vírgula) é inspecionado: o payload pode ter MBs.
+    header, _, b64 = src.partition(",")
+    if b64 and header[:11].lower() == "data:image/" and header[-7:].lower() == ";base64":
         try:
             raw = base64.b64decode(b64, validate=False)
         except Exception:
@@ -238,7 +441,7 @@ def _add_image(container, img: Tag) -> None:
 
         bio = BytesIO(raw)
         # tenta respeitar max-width do HTML (px -> inches usando 96dpi como aproximação)
-        style_map = _style_map_for(img)
+        style_map = _style_map_for(ctx, img)
         max_w_px = _extract_px(style_map, "max-width")
         if not max_w_px:
             max_w_px = _extract_px(style_map, "width")
@@ -251,7 +454,8 @@ def _add_image(container, img: Tag) -> None:
         width = Inches(max_w_px / 96.0) if max_w_px else None
         # insere em parágrafo (pra conseguir alinhar)
         p = container.add_paragraph()
-        if _closest_text_align_right(img):
+        # style="text-align: right" herdado (comum em HTML de e-mail)
+        if ctx.text_align == "right":
             p.alignment = WD_ALIGN_PARAGRAPH.RIGHT
         run = p.add_run()
         try:
@@ -268,133 +472,50 @@ def _add_image(container, img: Tag) -> None:
     return
 
 
-def _process_inline(paragraph, node: object, style: InlineStyle) -> None:
-    if isinstance(node, NavigableString):
-        text = str(node)
-        if not text:
-            return
-        run = paragraph.add_run(text)
-        run.bold = style.bold
-        run.italic = style.italic
-        run.underline = style.underline
-        return
-
-    if not isinstance(node, Tag):
-        return
-
-    name = node.name.lower()
-
-    if name in ("strong", "b"):
-        new_style = InlineStyle(bold=True or style.bold, italic=style.italic, underline=style.underline)
-        for child in _iter_child_nodes(node):
-            _process_inline(paragraph, child, new_style)
-        return
-
-    if name in ("em", "i"):
-        new_style = InlineStyle(bold=style.bold, italic=True or style.italic, underline=style.underline)
-        for child in _iter_child_nodes(node):
-            _process_inline(paragraph, child, new_style)
-        return
-
-    if name == "u":
-        new_style = InlineStyle(bold=style.bold, italic=style.italic, underline=True or style.underline)
-        for child in _iter_child_nodes(node):
-            _process_inline(paragraph, child, new_style)
-        return
-
-    if name == "br":
-        paragraph.add_run().add_break()
-        return
-
-    if name == "a":
-        url = (node.get("href") or "").strip()
-        text = _normalize_ws(node.get_text(" ", strip=True)) or url
-        _add_hyperlink(paragraph, url, text, style)
-        return
-
-    if name == "img":
-        # Imagem dentro de inline: ignora (tratamos <img> como bloco quando aparece como nó do container)
-        return
-
-    # default: span, etc.
-    for child in _iter_child_nodes(node):
-        _process_inline(paragraph, child, style)
-
-
-def _process_list(container, lst: Tag, ordered: bool) -> None:
-    style_name = "List Number" if ordered else "List Bullet"
-    for li in lst.find_all("li", recursive=False):
-        p = container.add_paragraph(style=style_name)
-        for child in _iter_child_nodes(li):
-            if isinstance(child, Tag) and child.name.lower() in BLOCK_TAGS and child.name.lower() not in ("strong", "b", "em", "i", "u", "a", "br", "span"):
-                # Se houver bloco dentro do <li>, processa como bloco (após o prefixo do item).
-                _process_block(container, child)
-            else:
-                _process_inline(p, child, InlineStyle())
-
-
 def _process_table(container, table_tag: Tag) -> None:
     # evita "duplicar" conteúdo quando existem tabelas aninhadas (muito comum em e-mails)
-    rows = [tr for tr in table_tag.find_all("tr") if tr.find_parent("table") is table_tag]
-    if not rows:
-        return
+    row_cells = [r.find_all(["td", "th"], recursive=False) for r in _direct_rows(table_tag)]
 
     # calcula número máximo de colunas (respeitando HTML "desbalanceado")
-    max_cols = 0
-    row_cells = []
-    for r in rows:
-        cells = r.find_all(["td", "th"], recursive=False)
-        row_cells.append(cells)
-        max_cols = max(max_cols, len(cells))
-
+    max_cols = max(map(len, row_cells), default=0)
     if max_cols == 0:
         return
 
-    tbl = container.add_table(rows=len(rows), cols=max_cols)
+    tbl = container.add_table(rows=len(row_cells), cols=max_cols)
     tbl.style = "Table Grid"
 
-    for i, cells in enumerate(row_cells):
-        for j in range(max_cols):
-            cell = tbl.cell(i, j)
-            if j >= len(cells):
-                cell.text = ""
-                continue
-            txt = cells[j].get_text(" ", strip=True)
-            cell.text = _normalize_ws(txt)
+    # células além das do HTML já nascem vazias: só preenche as existentes
+    for tcs, cells in zip(_iter_table_tc_rows(tbl), row_cells):
+        for tc, td in zip(tcs, cells):
+            _fast_cell_text(tc, _normalize_ws(td.get_text(" ", strip=True)))
 
 
-def _process_layout_table_as_docx_table(container, table_tag: Tag) -> None:
+def _process_layout_table_as_docx_table(ctx: RenderContext, container, table_tag: Tag) -> list[tuple]:
     """
     Tabelas de layout em e-mails carregam a estrutura (colunas/alinhamentos).
-    Aqui criamos uma tabela do Word sem bordas e processamos conteúdo por célula.
+    Aqui criamos uma tabela do Word sem bordas; o conteúdo de cada célula volta
+    como item de trabalho (container) pra travessia em _walk.
     """
-    rows = [tr for tr in table_tag.find_all("tr") if tr.find_parent("table") is table_tag]
-    if not rows:
-        return
-
-    row_cells: list[list[Tag]] = []
-    max_cols = 0
-    for r in rows:
-        cells = r.find_all(["td", "th"], recursive=False)
-        row_cells.append(cells)
-        max_cols = max(max_cols, len(cells))
+    rows = list(_direct_rows(table_tag))
+    row_cells: list[list[Tag]] = [r.find_all(["td", "th"], recursive=False) for r in rows]
 
+    max_cols = max(map(len, row_cells), default=0)
     if max_cols == 0:
-        return
+        return []
 
     tbl = container.add_table(rows=len(rows), cols=max_cols)
     _remove_table_borders(tbl)
     tbl.autofit = True
 
-    for i, cells in enumerate(row_cells):
-        for j in range(max_cols):
-            docx_cell = tbl.cell(i, j)
-            # limpa parágrafo padrão
-            if docx_cell.paragraphs:
-                docx_cell.paragraphs[0].text = ""
-            if j >= len(cells):
-                continue
-            _process_container(docx_cell, cells[j])
+    # o parágrafo padrão de cada célula nova já é vazio; células além das do HTML ficam assim
+    items = []
+    for tr, tcs, cells in zip(rows, _iter_table_tc_rows(tbl), row_cells):
+        # thead/tbody/tfoot entre a tabela e a linha também passam text-align adiante
+        section = tr.parent
+        row_ctx = (ctx if section is table_tag else ctx.enter(section)).enter(tr)
+        for tc, td in zip(tcs, cells):
+            items.append((_WALK_CONTAINER, td, _Cell(tc, tbl), row_ctx))
+    return items
 
 
 def _process_heading(container, tag: Tag) -> None:
@@ -419,76 +540,146 @@ def _process_heading(container, tag: Tag) -> None:
                 r.font.bold = True
 
 
-def _process_paragraph(container, tag: Tag) -> None:
-    p = container.add_paragraph()
-    for child in _iter_child_nodes(tag):
-        _process_inline(p, child, InlineStyle())
-
-
 def _process_hr(container) -> None:
     container.add_paragraph("—" * 20)
 
 
-def _process_block(container, tag: Tag) -> None:
-    name = tag.name.lower()
+def _push_inline_children(stack: list[tuple], tag: Tag, paragraph) -> None:
+    # ordem reversa: o primeiro filho fica no topo da pilha
+    stack.extend([(_WALK_INLINE, child, paragraph, None) for child in _iter_child_nodes(tag)][::-1])
 
-    if name in ("h1", "h2", "h3", "h4", "h5", "h6"):
-        _process_heading(container, tag)
-        return
 
-    if name == "p":
-        _process_paragraph(container, tag)
-        return
-
-    if name == "img":
-        _add_image(container, tag)
-        return
+def _walk(ctx: RenderContext, target, root: Tag) -> None:
+    """
+    Converte os filhos de `root` (tratado como container) em `target`.
 
-    if name == "hr":
-        _process_hr(container)
-        return
+    Travessia iterativa com pilha explícita de itens (ação, nó, destino, ctx)
+    em vez de recursão entre funções: filhos entram em ordem reversa pra saírem
+    na ordem do documento, e parágrafos só são criados quando o item sai da
+    pilha. O estilo inline é um bitfield local, restaurado por um marcador
+    empilhado antes dos filhos de cada tag de formatação.
+    """
+    style = 0
+    stack: list[tuple] = [(_WALK_CONTAINER, root, target, ctx)]
+    push = stack.append
+    pop = stack.pop
+
+    while stack:
+        action, node, sink, ctx = pop()
+
+        if action == _WALK_INLINE:
+            if isinstance(node, str):
+                if node:
+                    _add_styled_run(sink, node, style)
+                continue
 
-    if name in ("ul", "ol"):
-        _process_list(container, tag, ordered=(name == "ol"))
-        return
+            name = node.name
+            bit = _INLINE_STYLE_BITS.get(name)
+            if bit is not None:
+                push((_WALK_RESTORE_STYLE, style, None, None))
+                style |= bit
+            elif name == "br":
+                sink.add_run().add_break()
+                continue
+            elif name == "a":
+                url = (node.get("href") or "").strip()
+                text = _normalize_ws(node.get_text(" ", strip=True)) or url
+                _add_hyperlink(sink, url, text, style)
+                continue
+            elif name == "img":
+                # Imagem dentro de inline: ignora (tratamos <img> como bloco quando aparece como nó do container)
+                continue
+            # formatação e default (span, etc.): filhos no mesmo parágrafo
+            _push_inline_children(stack, node, sink)
+            continue
 
-    if name == "li":
-        # fallback: trata como um item bullet
-        p = container.add_paragraph(style="List Bullet")
-        for child in _iter_child_nodes(tag):
-            _process_inline(p, child, InlineStyle())
-        return
+        if action == _WALK_RESTORE_STYLE:
+            style = node
+            continue
 
-    if name == "table":
-        if _is_real_table(tag):
-            _process_table(container, tag)
-        else:
-            _process_layout_table_as_docx_table(container, tag)
-        return
+        if action == _WALK_TEXT:
+            text = _normalize_ws(node)
+            if text:
+                sink.add_paragraph(text)
+            continue
 
-    # default: container
-    _process_container(container, tag)
+        if action == _WALK_INLINE_ROOT:
+            # tags inline soltas dentro de container: vira parágrafo
+            push((_WALK_INLINE, node, sink.add_paragraph(), None))
+            continue
 
+        if action == _WALK_CONTAINER:
+            ctx = ctx.enter(node)
+            items = []
+            for child in _iter_child_nodes(node):
+                if isinstance(child, str):
+                    items.append((_WALK_TEXT, child, sink, None))
+                elif child.name in BLOCK_TAGS:
+                    items.append((_WALK_BLOCK, child, sink, ctx))
+                else:
+                    items.append((_WALK_INLINE_ROOT, child, sink, None))
+            stack.extend(items[::-1])
+            continue
 
-def _process_container(target, container: Tag) -> None:
-    for child in _iter_child_nodes(container):
-        if isinstance(child, NavigableString):
-            text = _normalize_ws(str(child))
-            if text:
-                target.add_paragraph(text)
+        if action == _WALK_LIST_ITEM:
+            style_name = "List Number" if node.parent.name == "ol" else "List Bullet"
+            p = sink.add_paragraph(style=style_name)
+            li_ctx = ctx.enter(node)
+            items = []
+            for child in _iter_child_nodes(node):
+                # Se houver bloco dentro do <li>, processa como bloco (após o prefixo do item).
+                # (BLOCK_TAGS não contém tags inline como strong/a/span/br)
+                if isinstance(child, Tag) and child.name in BLOCK_TAGS:
+                    items.append((_WALK_BLOCK, child, sink, li_ctx))
+                else:
+                    items.append((_WALK_INLINE, child, p, None))
+            stack.extend(items[::-1])
             continue
 
-        if isinstance(child, Tag):
-            name = child.name.lower()
-            if name in BLOCK_TAGS:
-                _process_block(target, child)
+        # _WALK_BLOCK
+        name = node.name
+        ctx = ctx.enter(node)
+
+        if name in _HEADING_TAGS:
+            _process_heading(sink, node)
+        elif name == "p":
+            _push_inline_children(stack, node, sink.add_paragraph())
+        elif name == "img":
+            _add_image(ctx, sink, node)
+        elif name == "hr":
+            _process_hr(sink)
+        elif name in ("ul", "ol"):
+            stack.extend([(_WALK_LIST_ITEM, li, sink, ctx) for li in node.find_all("li", recursive=False)][::-1])
+        elif name == "li":
+            # fallback: trata como um item bullet
+            _push_inline_children(stack, node, sink.add_paragraph(style="List Bullet"))
+        elif name == "table":
+            if _is_real_table(node):
+                _process_table(sink, node)
             else:
-                # tags inline soltas dentro de container: vira parágrafo
-                p = target.add_paragraph()
-                _process_inline(p, child, InlineStyle())
+                stack.extend(_process_layout_table_as_docx_table(ctx, sink, node)[::-1])
+        else:
+            # default: container
+            push((_WALK_CONTAINER, node, sink, ctx))
+
 
+def _render_html(ctx: RenderContext, doc, html_content: str) -> None:
+    # só monta o <body>; sem <body> (fragmento no html.parser), parse completo
+    soup = _make_soup(html_content, parse_only=SoupStrainer("body"))
+    if soup.body is None:
+        soup = _make_soup(html_content)
+    else:
+        ctx = _html_tag_context(ctx, html_content)
 
-def _html_to_docx_sync(html_content: str) -> BytesIO:
+    # remove ruído (só o que sobrou dentro do <body>)
+    for t in soup.find_all(["script", "style"]):
+        t.decompose()
+
+    root = soup.body or soup
+    _walk(_root_context(ctx, root), doc, root)
+
+
+def _html_to_docx_sync(html_content: str) -> str:
     """
     Converte HTML para DOCX de forma síncrona.
 
@@ -496,20 +687,19 @@ def _html_to_docx_sync(html_content: str) -> BytesIO:
         html_content: Conteúdo HTML a ser convertido
 
     Returns:
-        BytesIO com o DOCX gerado.
+        Caminho do DOCX gerado num arquivo temporário (quem chama remove).
     """
-    global _CSS_CLASS_STYLES
-    
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        # captura CSS dos <style> antes de remover
-        css_text = "\n".join((t.get_text("\n") or "") for t in soup.find_all("style"))
-        _CSS_CLASS_STYLES = _parse_css_class_rules(css_text)
+        # CSS vem direto do texto: o <head> nem chega a virar árvore
+        css_text = _extract_css_text(html_content)
+        # sem "." ou "{" não há regra `.classe { }` (caso comum: só style inline);
+        # pula o parser e o hash do texto no cache
+        if "." in css_text and "{" in css_text:
+            css_classes = _parse_css_class_rules(css_text)
+        else:
+            css_classes = _NO_CSS_CLASSES
 
-        # remove ruído
-        for t in soup.find_all(["script", "style"]):
-            t.decompose()
+        ctx = RenderContext(css_classes=css_classes, style_cache={})
 
         doc = Document()
         _set_default_document_style(doc)
@@ -524,19 +714,24 @@ def _html_to_docx_sync(html_content: str) -> BytesIO:
         except Exception:
             pass
 
-        root = soup.body or soup
-        _process_container(doc, root)
+        _render_html(ctx, doc, html_content)
 
-        buffer = BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-        return buffer
+        # arquivo em vez de BytesIO: só o caminho volta do pool de processos e a
+        # resposta é servida direto do disco (sem o DOCX inteiro em memória)
+        fd, docx_path = tempfile.mkstemp(suffix=".docx")
+        try:
+            with os.fdopen(fd, "wb") as docx_file:
+                doc.save(docx_file)
+        except Exception:
+            os.remove(docx_path)
+            raise
+        return docx_path
     
     except Exception as e:
         raise HTMLConversionError(f"Erro na conversão HTML para DOCX: {str(e)}")
 
 
-async def convert_html_to_docx(html_content: str) -> BytesIO:
+async def convert_html_to_docx(html_content: str) -> str:
     """
     Converte HTML para DOCX de forma assíncrona.
 
@@ -544,6 +739,6 @@ async def convert_html_to_docx(html_content: str) -> BytesIO:
         html_content: Conteúdo HTML a ser convertido
 
     Returns:
-        BytesIO com o arquivo DOCX
+        Caminho do arquivo DOCX temporário (quem chama remove)
     """
-    return await run_in_threadpool(_html_to_docx_sync, html_content)
+    return await run_in_process_pool(_html_to_docx_sync, html_content)
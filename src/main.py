@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from src.config import settings
 from src.pdf_to_docx.router import router as pdf_to_docx_router
 from src.html_to_docx.router import router as html_to_docx_router
+from src.process_pool import default_workers, start_process_pool, shutdown_process_pool
 from contextlib import asynccontextmanager
 import logging
 
@@ -23,7 +24,10 @@ async def lifespan(app: FastAPI):
     logger.info("FastAPI app initialized")
     logger.info(f"\ttitle: {settings.TITLE}")
     logger.info(f"\tversion: {settings.VERSION}")
+    start_process_pool(settings.CONVERSION_WORKERS)
+    logger.info(f"\tconversion workers: {settings.CONVERSION_WORKERS or default_workers()}")
     yield
+    shutdown_process_pool()
     logger.info("FastAPI app shutdown complete.")
 
 
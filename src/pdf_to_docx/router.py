@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import JSONResponse
 from src.pdf_to_docx.service import convert_pdf_to_docx
 from src.constants import DOCX_MIME_TYPE
+from src.responses import TempFileResponse
 from src.pdf_to_docx.dependencies import pdf_dependency
 from src.pdf_to_docx.examples import get_response_examples
 
@@ -26,19 +27,20 @@ async def health_check():
     status_code=status.HTTP_200_OK,
     description="Recebe um arquivo PDF e converte para DOCX",
     summary="Converter PDF em DOCX",
-    response_class=StreamingResponse,
+    response_class=TempFileResponse,
     responses=get_response_examples(),
 )
 async def convert_pdf_file(
     pdf: dict = Depends(pdf_dependency),
-) -> StreamingResponse:
+) -> TempFileResponse:
 
-    docx_buffer = await convert_pdf_to_docx(pdf.get("data"))
+    docx_path = await convert_pdf_to_docx(pdf.get("data"))
 
     filename = f"{(pdf.get('filename') if 'filename' in pdf else 'download').rsplit('.', 1)[0]}.docx"
 
-    return StreamingResponse(
-        docx_buffer,
+    # servido direto do arquivo temporário, removido depois do envio
+    return TempFileResponse(
+        docx_path,
         media_type=DOCX_MIME_TYPE,
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"; charset=utf-8'
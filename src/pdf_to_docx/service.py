@@ -1,51 +1,43 @@
 from pdf2docx import Converter
-from fastapi.concurrency import run_in_threadpool
-from io import BytesIO
 import tempfile
 import os
 from src.pdf_to_docx.exceptions import ConversionError
+from src.process_pool import run_in_process_pool
 
 
-def _convert_pdf_to_docx_sync(pdf_bytes: bytes) -> BytesIO:
-    """Synchronous conversion of PDF to DOCX using temporary files."""
-    docx_buffer = BytesIO()
-    
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as pdf_temp:
-        pdf_temp.write(pdf_bytes)
-        pdf_temp_path = pdf_temp.name
-    
-    docx_temp_path = pdf_temp_path.replace(".pdf", ".docx")
+def _convert_pdf_to_docx_sync(pdf_bytes: bytes) -> str:
+    """
+    Synchronous conversion of PDF to DOCX. Reads the PDF from memory and
+    returns the path of a temporary .docx file (the caller removes it).
+    """
+    fd, docx_path = tempfile.mkstemp(suffix=".docx")
+    cv = None
     
     try:
-        cv = Converter(pdf_temp_path)
-        # Parâmetros para reduzir detecção incorreta de tabelas:
-        # - connected_border_tolerance: tolerância para bordas conectadas (default 0.5)
-        # - min_section_height: altura mínima para seção (default 20)
-        # - float_layout_tolerance: tolerância para layout flutuante (default 0.1)
-        cv.convert(
-            docx_temp_path,
-            connected_border_tolerance=0.8,  # Aumenta tolerância de bordas
-            min_section_height=30,  # Aumenta altura mínima de seção
-            float_layout_tolerance=0.2,  # Aumenta tolerância de layout
-        )
-        cv.close()
-        
-        with open(docx_temp_path, "rb") as docx_file:
-            docx_buffer.write(docx_file.read())
+        with os.fdopen(fd, "wb") as docx_file:
+            cv = Converter(stream=pdf_bytes)
+            # Parâmetros para reduzir detecção incorreta de tabelas:
+            # - connected_border_tolerance: tolerância para bordas conectadas (default 0.5)
+            # - min_section_height: altura mínima para seção (default 20)
+            # - float_layout_tolerance: tolerância para layout flutuante (default 0.1)
+            cv.convert(
+                docx_file,
+                connected_border_tolerance=0.8,  # Aumenta tolerância de bordas
+                min_section_height=30,  # Aumenta altura mínima de seção
+                float_layout_tolerance=0.2,  # Aumenta tolerância de layout
+            )
         
-        docx_buffer.seek(0)
-        return docx_buffer
+        return docx_path
     
     except Exception as e:
+        os.remove(docx_path)
         raise ConversionError(f"Erro na conversão: {str(e)}")
     
     finally:
-        if os.path.exists(pdf_temp_path):
-            os.remove(pdf_temp_path)
-        if os.path.exists(docx_temp_path):
-            os.remove(docx_temp_path)
+        if cv is not None:
+            cv.close()
 
 
-async def convert_pdf_to_docx(pdf_bytes: bytes) -> BytesIO:
-    """Converte PDF para DOCX de forma assíncrona."""
-    return await run_in_threadpool(_convert_pdf_to_docx_sync, pdf_bytes)
+async def convert_pdf_to_docx(pdf_bytes: bytes) -> str:
+    """Converte PDF para DOCX de forma assíncrona; devolve o caminho do DOCX temporário."""
+    return await run_in_process_pool(_convert_pdf_to_docx_sync, pdf_bytes)
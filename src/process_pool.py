@@ -0,0 +1,96 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.exceptions import ServiceUnavailable
+
+# Pool de processos para as conversões (CPU-bound em Python: no threadpool
+# duas requisições simultâneas disputam o GIL). Criado no startup do FastAPI.
+_pool: ProcessPoolExecutor | None = None
+_max_workers: int = 1
+_pool_lock = threading.Lock()
+
+# Teto do default: cada worker (spawn) importa pdf2docx/PyMuPDF/cv2 do zero.
+_DEFAULT_MAX_WORKERS = 4
+
+
+def default_workers() -> int:
+    """
+    CPUs que o processo pode usar, limitado a _DEFAULT_MAX_WORKERS.
+    os.cpu_count() no container devolve os núcleos do host.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # sem sched_getaffinity (macOS/Windows)
+        cpus = os.cpu_count() or 1
+    return max(1, min(cpus, _DEFAULT_MAX_WORKERS))
+
+
+def _new_pool() -> ProcessPoolExecutor:
+    # spawn: não herda threads/loop do processo do uvicorn (fork seria inseguro)
+    return ProcessPoolExecutor(
+        max_workers=_max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def start_process_pool(max_workers: int | None = None) -> None:
+    global _pool, _max_workers
+    with _pool_lock:
+        if _pool is None:
+            _max_workers = max_workers or default_workers()
+            _pool = _new_pool()
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _replace_broken_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor | None:
+    """
+    Troca o pool quebrado por um novo. Várias requisições podem ver o mesmo
+    pool quebrar ao mesmo tempo: só a primeira recria, as demais reaproveitam.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = _new_pool()
+        pool = _pool
+    broken.shutdown(wait=False, cancel_futures=True)
+    return pool
+
+
+async def run_in_process_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Executa `func(*args)` no pool de processos. `func`, argumentos, retorno e
+    exceções precisam ser picklable.
+
+    Sem pool iniciado (fora do lifespan do app), cai para o threadpool.
+
+    Se um worker morre (OOM kill, crash em extensão C), o executor fica
+    inutilizável (BrokenProcessPool): ele é recriado e a chamada repetida uma
+    vez. Se quebrar de novo (provavelmente a própria entrada derruba o
+    worker), o pool é recriado pras próximas requisições e esta recebe 503.
+    """
+    pool = _pool
+    if pool is None:
+        return await run_in_threadpool(func, *args)
+    loop = asyncio.get_running_loop()
+    for _ in range(2):
+        try:
+            return await loop.run_in_executor(pool, func, *args)
+        except BrokenProcessPool:
+            pool = _replace_broken_pool(pool)
+            if pool is None:  # shutdown no meio do caminho
+                break
+    raise ServiceUnavailable("Conversor temporariamente indisponível, tente novamente")
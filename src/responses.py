@@ -0,0 +1,39 @@
+import os
+from typing import Iterator, Mapping
+
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class TempFileResponse(StreamingResponse):
+    """
+    Envia um arquivo temporário em blocos e o remove ao fim do envio, em
+    qualquer desfecho (cliente desconectou, erro no meio, etc.).
+
+    Não usa FileResponse: ele responde 206/416 a `Range` (sem sentido num POST
+    de conversão) e, nas respostas de Range inválido, retorna antes de rodar o
+    BackgroundTask, deixando o arquivo no disco.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        media_type: str | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        self.path = path
+        headers = {**(headers or {}), "Content-Length": str(os.path.getsize(path))}
+        super().__init__(self._iter_file(), media_type=media_type, headers=headers)
+
+    def _iter_file(self) -> Iterator[bytes]:
+        with open(self.path, "rb") as f:
+            while chunk := f.read(_CHUNK_SIZE):
+                yield chunk
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            os.remove(self.path)
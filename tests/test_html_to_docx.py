@@ -0,0 +1,105 @@
+import base64
+import os
+import struct
+import time
+import zlib
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+from src.html_to_docx.service import _extract_css_text, _html_to_docx_sync, _parse_css_class_rules
+
+
+def _png(width: int, height: int) -> bytes:
+    """PNG RGB sem compressão (zlib nível 0): o tamanho cresce com width x height."""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = b"\x00" + b"\x7f" * (width * 3)
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", ihdr)
+        + chunk(b"IDAT", zlib.compress(row * height, 0))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _convert(html_content: str) -> Document:
+    docx_path = _html_to_docx_sync(html_content)
+    try:
+        return Document(docx_path)
+    finally:
+        os.remove(docx_path)
+
+
+def test_data_uri_image_over_10mb_is_kept():
+    # libxml2 sem huge_tree trunca atributos de ~10 MB e o src chega vazio
+    png = _png(2000, 1500)
+    src = "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+    assert len(src) > 10 * 1024 * 1024
+
+    doc = _convert(f'<html><body><p>antes</p><img src="{src}"><p>depois</p></body></html>')
+
+    assert len(doc.inline_shapes) == 1
+
+
+def _img_tag() -> str:
+    return '<img src="data:image/png;base64,' + base64.b64encode(_png(4, 4)).decode("ascii") + '">'
+
+
+def _image_alignments(doc: Document) -> list:
+    return [p.alignment for p in doc.paragraphs if p.runs and p.runs[0]._r.xpath(".//w:drawing")]
+
+
+def test_style_inside_outlook_conditional_comment_is_ignored():
+    doc = _convert(
+        "<html><head>"
+        "<style>.cta { text-align: right }</style>"
+        "<!--[if mso]><style>.cta { text-align: left }</style><![endif]-->"
+        f'</head><body><div class="cta">{_img_tag()}</div></body></html>'
+    )
+
+    assert _image_alignments(doc) == [WD_ALIGN_PARAGRAPH.RIGHT]
+
+
+@pytest.mark.parametrize("opener", ["<style>", "<!--", "<style"])
+def test_css_extraction_is_linear_on_unterminated_openers(opener):
+    # aberturas sem terminador: uma regex com corpo lazy levava segundos aqui
+    start = time.perf_counter()
+    assert _extract_css_text(opener * 20000) == ""
+    assert time.perf_counter() - start < 0.1
+
+
+@pytest.mark.parametrize(
+    "html_open",
+    ['<html style="text-align: right">', '<html class="page">'],
+)
+def test_text_align_is_inherited_from_html_tag(html_open):
+    doc = _convert(
+        f"{html_open}<head><style>.page {{ text-align: right }}</style></head>"
+        f"<body>{_img_tag()}</body></html>"
+    )
+
+    assert _image_alignments(doc) == [WD_ALIGN_PARAGRAPH.RIGHT]
+
+
+def test_text_align_is_inherited_from_tbody():
+    doc = _convert(
+        '<html><body><table><tbody style="text-align: right">'
+        f"<tr><td>{_img_tag()}</td></tr>"
+        "</tbody></table></body></html>"
+    )
+
+    cell = doc.tables[0].cell(0, 0)
+    assert [p.alignment for p in cell.paragraphs if p.runs] == [WD_ALIGN_PARAGRAPH.RIGHT]
+
+
+def test_cached_css_class_rules_are_read_only():
+    rules = _parse_css_class_rules(".cta { text-align: right }")
+
+    with pytest.raises(TypeError):
+        rules["cta"]["text-align"] = "left"
+    assert _parse_css_class_rules(".cta { text-align: right }")["cta"]["text-align"] == "right"
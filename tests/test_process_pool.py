@@ -0,0 +1,28 @@
+import asyncio
+import os
+import signal
+
+import pytest
+
+from src.exceptions import ServiceUnavailable
+from src.process_pool import run_in_process_pool, shutdown_process_pool, start_process_pool
+
+
+def _kill_worker() -> None:
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+@pytest.fixture
+def process_pool():
+    start_process_pool(1)
+    yield
+    shutdown_process_pool()
+
+
+def test_pool_recovers_after_worker_dies(process_pool):
+    async def scenario():
+        with pytest.raises(ServiceUnavailable):
+            await run_in_process_pool(_kill_worker)
+        return await run_in_process_pool(sum, [1, 2, 3])
+
+    assert asyncio.run(scenario()) == 6
@@ -0,0 +1,29 @@
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+
+@pytest.fixture
+def temp_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.parametrize("range_header", ["bytes=abc", "bytes=99999999-", "bytes=0-10"])
+def test_docx_response_ignores_range_and_removes_temp_file(temp_dir, range_header):
+    # sem `with`: fora do lifespan a conversão roda no threadpool, no mesmo processo
+    client = TestClient(app)
+
+    response = client.post(
+        "/html-to-docx/",
+        files={"html": ("a.html", b"<p>ok</p>", "text/html")},
+        headers={"Range": range_header},
+    )
+
+    assert response.status_code == 200
+    assert response.content[:2] == b"PK"
+    assert int(response.headers["content-length"]) == len(response.content)
+    assert list(temp_dir.iterdir()) == []